@@ -1,114 +1,378 @@
-import json
+import bisect
 import os
 import random
 import math
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+try:
+    import orjson
+    _loads = orjson.loads
+    _dumps = lambda obj: orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    _dumps_compact = orjson.dumps
+except ImportError:
+    import json
+    _loads = json.loads
+    _dumps = lambda obj: json.dumps(obj, indent=2).encode()
+    _dumps_compact = lambda obj: json.dumps(obj, separators=(',', ':')).encode()
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# ELO K-factor: maximum rating change per match
+K_FACTOR = 32
+
+# Number of matches to play before flushing ratings to disk
+SAVE_INTERVAL = 10
+
+# ln(10) / 400, so 10 ** (x / 400) == exp(_LN10_400 * x)
+_LN10_400 = math.log(10) / 400.0
+
+
+class RatingRow:
+    """Rating and stats for one item; slots keep field access cheap"""
+    __slots__ = ("rating", "plays", "wins", "losses", "date_added", "biggest_win", "lowest_loss")
+    
+    def __init__(self, rating=1000, plays=0, wins=0, losses=0, date_added=None, biggest_win=0, lowest_loss=0):
+        self.rating = rating
+        self.plays = plays
+        self.wins = wins
+        self.losses = losses
+        self.date_added = date_added
+        self.biggest_win = biggest_win
+        self.lowest_loss = lowest_loss
+
+
+# Per-item rating fields, stored on disk as one column per field
+RATING_FIELDS = RatingRow.__slots__
+
+# Compiled replay kernel; None until first use, False if numba is missing
+_elo_replay = None
+
+
+def _elo_replay_py(ratings, biggest_win, lowest_loss, winners, losers, k):
+    """Sequentially apply matches to rating arrays (numba kernel source)"""
+    for i in range(winners.shape[0]):
+        w = winners[i]
+        l = losers[i]
+        expected = 1.0 / (1.0 + math.exp(_LN10_400 * (ratings[l] - ratings[w])))
+        change = k * (1.0 - expected)
+        ratings[w] += change
+        ratings[l] -= change
+        if change > biggest_win[w]:
+            biggest_win[w] = change
+        if change > lowest_loss[l]:
+            lowest_loss[l] = change
+
+
+def _ratings_to_soa(ratings):
+    """Convert {item: RatingRow} into column lists for saving"""
+    items = list(ratings)
+    soa = {"items": items}
+    for field in RATING_FIELDS:
+        soa[field] = [getattr(ratings[item], field) for item in items]
+    return soa
+
+
+def _soa_to_dict(soa):
+    """Convert saved column lists back into {item: RatingRow}"""
+    columns = [soa[field] for field in RATING_FIELDS]
+    return {item: RatingRow(*row) for item, row in zip(soa["items"], zip(*columns))}
+
+
+def get_elo_replay():
+    """Return the numba-compiled replay kernel, or None if numba is unavailable"""
+    global _elo_replay
+    if _elo_replay is None:
+        try:
+            from numba import njit
+        except ImportError:
+            _elo_replay = False
+        else:
+            _elo_replay = njit(cache=True)(_elo_replay_py)
+    return _elo_replay or None
+
+
 class PriorityRanker:
     def __init__(self):
         self.themes_dir = "themes"
+        # Bumped whenever themes or items change; cached values carry the
+        # version they were read at and are reloaded when it moves on
+        self._themes_version = 0
+        self._themes_cache = None
+        self._items_cache = {}
+        self._complete_ratings = {}
+        self._rankings = {}
+        # Created on the first background save; see save_ratings_async
+        self._executor = None
         self.ensure_themes_dir()
     
+    def close(self):
+        """Wait for pending background saves and stop the worker thread"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+    
     def ensure_themes_dir(self):
         """Create themes directory if it doesn't exist"""
         if not os.path.exists(self.themes_dir):
             os.makedirs(self.themes_dir)
     
+    def invalidate_caches(self):
+        """Forget cached theme list, items and rankings"""
+        self._themes_version += 1
+        self._rankings = {}
+    
     def get_themes(self):
         """Get list of available themes"""
+        if self._themes_cache is not None and self._themes_cache[0] == self._themes_version:
+            return self._themes_cache[1]
+        
+        suffix = '_items.json'
         themes = []
         if os.path.exists(self.themes_dir):
-            files = os.listdir(self.themes_dir)
-            items_files = [f for f in files if f.endswith('_items.json')]
-            themes = [f.replace('_items.json', '') for f in items_files]
-        return sorted(themes)
+            with os.scandir(self.themes_dir) as entries:
+                themes = sorted(e.name[:-len(suffix)] for e in entries
+                                if e.name.endswith(suffix) and e.is_file())
+        self._themes_cache = (self._themes_version, themes)
+        return themes
+    
+    def get_item_count(self, theme):
+        """Get number of items in a theme"""
+        return len(self._load_items_cached(theme))
     
     def load_items(self, theme):
         """Load items for a theme"""
+        # Copy so callers can modify the list without touching the cache
+        return list(self._load_items_cached(theme))
+    
+    def _load_items_cached(self, theme):
+        """Load items for a theme, reusing the last read if still current"""
+        cached = self._items_cache.get(theme)
+        if cached is not None and cached[0] == self._themes_version:
+            return cached[1]
+        
+        items = []
         items_file = os.path.join(self.themes_dir, f"{theme}_items.json")
         if os.path.exists(items_file):
-            with open(items_file, 'r') as f:
-                return json.load(f)
-        return []
+            with open(items_file, 'rb') as f:
+                items = _loads(f.read())
+        self._items_cache[theme] = (self._themes_version, items)
+        return items
+    
+    def _write_atomic(self, path, data):
+        """Write bytes via a temp file so an interrupted save never truncates path"""
+        tmp = path + '.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, path)
     
     def save_items(self, theme, items):
         """Save items for a theme"""
         items_file = os.path.join(self.themes_dir, f"{theme}_items.json")
-        with open(items_file, 'w') as f:
-            json.dump(items, f, indent=2)
+        self._write_atomic(items_file, _dumps(items))
     
     def load_ratings(self, theme):
         """Load ratings for a theme"""
         ratings_file = os.path.join(self.themes_dir, f"{theme}_ratings.json")
         if os.path.exists(ratings_file):
-            with open(ratings_file, 'r') as f:
-                return json.load(f)
+            with open(ratings_file, 'rb') as f:
+                data = _loads(f.read())
+            if isinstance(data.get("items"), list):
+                return _soa_to_dict(data)
+            # Old dict-per-item format: rewrite it in the column layout
+            ratings = {item: RatingRow(**stats) for item, stats in data.items()}
+            self.save_ratings(theme, ratings)
+            return ratings
         return {}
     
     def save_ratings(self, theme, ratings):
         """Save ratings for a theme"""
+        self._save_ratings_soa(theme, _ratings_to_soa(ratings))
+    
+    def save_ratings_async(self, theme, ratings):
+        """Save ratings in the background, returning a Future"""
+        if self._executor is None:
+            # Single worker so background saves land on disk in order
+            self._executor = ThreadPoolExecutor(max_workers=1)
+        # Snapshot now so later matches can't change the data mid-write
+        return self._executor.submit(self._save_ratings_soa, theme, _ratings_to_soa(ratings))
+    
+    def _save_ratings_soa(self, theme, soa):
+        """Write ratings already converted to the column layout"""
         ratings_file = os.path.join(self.themes_dir, f"{theme}_ratings.json")
-        with open(ratings_file, 'w') as f:
-            json.dump(ratings, f, indent=2)
+        # Ratings are machine-managed, so skip the indentation
+        self._write_atomic(ratings_file, _dumps_compact(soa))
     
     def initialize_ratings(self, theme, items):
         """Initialize ratings for new items"""
+        # Ratings already known to cover every item are kept in memory
+        cached = self._complete_ratings.get(theme)
+        if cached is not None and cached[0] == self._themes_version:
+            return cached[1]
         ratings = self.load_ratings(theme)
         updated = False
+        now = datetime.now().isoformat()
         
         for item in items:
             if item not in ratings:
-                ratings[item] = {
-                    "rating": 1000,
-                    "plays": 0,
-                    "wins": 0,
-                    "losses": 0,
-                    "date_added": datetime.now().isoformat(),
-                    "biggest_win": 0,
-                    "lowest_loss": 0
-                }
+                ratings[item] = RatingRow(date_added=now)
                 updated = True
         
         if updated:
             self.save_ratings(theme, ratings)
+        self._complete_ratings[theme] = (self._themes_version, ratings)
         return ratings
     
-    def calculate_elo_change(self, winner_rating, loser_rating, k=32):
+    def calculate_elo_change(self, winner_rating, loser_rating, k=K_FACTOR):
         """Calculate ELO rating change"""
-        expected_winner = 1 / (1 + math.pow(10, (loser_rating - winner_rating) / 400))
-        expected_loser = 1 / (1 + math.pow(10, (winner_rating - loser_rating) / 400))
+        expected_winner = 1.0 / (1.0 + math.exp(_LN10_400 * (loser_rating - winner_rating)))
         
-        winner_change = k * (1 - expected_winner)
-        loser_change = k * (0 - expected_loser)
+        # expected_loser == 1 - expected_winner, so the changes mirror each other
+        change = k * (1 - expected_winner)
         
-        return winner_change, loser_change
+        return change, -change
     
-    def update_ratings(self, theme, winner, loser):
-        """Update ELO ratings after a match"""
-        ratings = self.load_ratings(theme)
-        
-        winner_rating = ratings[winner]["rating"]
-        loser_rating = ratings[loser]["rating"]
+    def get_sorted_rankings(self, theme, items, ratings):
+        """Get (-rating, position, item) tuples sorted best first, cached per theme"""
+        cached = self._rankings.get(theme)
+        if cached is not None and cached[0] is ratings:
+            return cached[1]
+        
+        # Position breaks ties so equal ratings keep insertion order
+        ranking = sorted((-ratings[item].rating, i, item) for i, item in enumerate(items))
+        positions = {item: i for i, item in enumerate(items)}
+        if len(positions) == len(items):
+            # The cache is tied to this ratings dict; with duplicate items
+            # a position can't identify an entry, so don't cache at all
+            self._rankings[theme] = (ratings, ranking, positions)
+        else:
+            self._rankings.pop(theme, None)
+        return ranking
+    
+    def _move_in_rankings(self, ranking, positions, item, old_rating, new_rating):
+        """Reposition one item in a sorted ranking list, False if it isn't there"""
+        entry = (-old_rating, positions.get(item), item)
+        idx = bisect.bisect_left(ranking, entry)
+        if idx == len(ranking) or ranking[idx] != entry:
+            return False
+        del ranking[idx]
+        bisect.insort(ranking, (-new_rating, entry[1], item))
+        return True
+    
+    def update_ratings(self, ratings, winner, loser, theme=None):
+        """Update ELO ratings in place after a match"""
+        w = ratings[winner]
+        l = ratings[loser]
+        winner_rating = w.rating
+        loser_rating = l.rating
         
         winner_change, loser_change = self.calculate_elo_change(winner_rating, loser_rating)
         
         # Update ratings
-        ratings[winner]["rating"] += winner_change
-        ratings[loser]["rating"] += loser_change
+        w.rating += winner_change
+        l.rating += loser_change
         
         # Update stats
-        ratings[winner]["plays"] += 1
-        ratings[winner]["wins"] += 1
-        ratings[loser]["plays"] += 1
-        ratings[loser]["losses"] += 1
+        w.plays += 1
+        w.wins += 1
+        l.plays += 1
+        l.losses += 1
         
         # Track biggest win/loss
-        if winner_change > ratings[winner]["biggest_win"]:
-            ratings[winner]["biggest_win"] = winner_change
-        if abs(loser_change) > ratings[loser]["lowest_loss"]:
-            ratings[loser]["lowest_loss"] = abs(loser_change)
+        if winner_change > w.biggest_win:
+            w.biggest_win = winner_change
+        if abs(loser_change) > l.lowest_loss:
+            l.lowest_loss = abs(loser_change)
+        
+        # Keep the cached ranking order in sync
+        cached = self._rankings.get(theme)
+        if cached is not None:
+            _, ranking, positions = cached
+            # Drop the cache rather than guess if it was built from another
+            # ratings dict or no longer matches
+            if (cached[0] is not ratings
+                    or not self._move_in_rankings(ranking, positions, winner, winner_rating, w.rating)
+                    or not self._move_in_rankings(ranking, positions, loser, loser_rating, l.rating)):
+                self._rankings.pop(theme, None)
+    
+    def bulk_update_ratings(self, theme, matches):
+        """Replay a list of (winner, loser) matches and save the result"""
+        items = self.load_items(theme)
+        ratings = self.initialize_ratings(theme, items)
+        
+        if np is None:
+            for winner, loser in matches:
+                self.update_ratings(ratings, winner, loser)
+        else:
+            self._bulk_update_numpy(ratings, items, matches)
         
+        self._rankings.pop(theme, None)
         self.save_ratings(theme, ratings)
+        return ratings
+    
+    def _bulk_update_numpy(self, ratings, items, matches, k=K_FACTOR):
+        """Vectorized version of update_ratings over many matches"""
+        index = {item: i for i, item in enumerate(items)}
+        pairs = [(index[winner], index[loser]) for winner, loser in matches]
+        if not pairs:
+            return
+        
+        winners = np.array([w for w, _ in pairs], dtype=np.intp)
+        losers = np.array([l for _, l in pairs], dtype=np.intp)
+        
+        r = np.fromiter((ratings[it].rating for it in items), dtype=np.float64, count=len(items))
+        biggest_win = np.fromiter((ratings[it].biggest_win for it in items), dtype=np.float64, count=len(items))
+        lowest_loss = np.fromiter((ratings[it].lowest_loss for it in items), dtype=np.float64, count=len(items))
+        
+        # The numba kernel handles the sequential dependency directly
+        replay = get_elo_replay()
+        if replay is not None:
+            replay(r, biggest_win, lowest_loss, winners, losers, float(k))
+        else:
+            self._replay_segments(r, biggest_win, lowest_loss, pairs, winners, losers, k)
+        
+        wins = np.bincount(winners, minlength=len(items))
+        losses = np.bincount(losers, minlength=len(items))
+        
+        for i, item in enumerate(items):
+            if wins[i] == 0 and losses[i] == 0:
+                continue
+            stats = ratings[item]
+            stats.rating = float(r[i])
+            stats.plays += int(wins[i] + losses[i])
+            stats.wins += int(wins[i])
+            stats.losses += int(losses[i])
+            stats.biggest_win = float(biggest_win[i])
+            stats.lowest_loss = float(lowest_loss[i])
+    
+    def _replay_segments(self, r, biggest_win, lowest_loss, pairs, winners, losers, k):
+        """Apply matches with NumPy, one run of independent matches at a time"""
+        # A match depends on earlier results for the same items, so split the
+        # history into runs where no item appears twice and vectorize each run
+        boundaries = []
+        seen = set()
+        for i, (w, l) in enumerate(pairs):
+            if w in seen or l in seen:
+                boundaries.append(i)
+                seen = set()
+            seen.add(w)
+            seen.add(l)
+        boundaries.append(len(pairs))
+        
+        start = 0
+        for end in boundaries:
+            w_idx = winners[start:end]
+            l_idx = losers[start:end]
+            expected = 1.0 / (1.0 + np.exp(_LN10_400 * (r[l_idx] - r[w_idx])))
+            change = k * (1.0 - expected)
+            r[w_idx] += change
+            r[l_idx] -= change
+            biggest_win[w_idx] = np.maximum(biggest_win[w_idx], change)
+            lowest_loss[l_idx] = np.maximum(lowest_loss[l_idx], change)
+            start = end
     
     def create_theme(self):
         """Create a new theme"""
@@ -126,6 +390,7 @@ class PriorityRanker:
         # Create empty files
         self.save_items(theme_name, [])
         self.save_ratings(theme_name, {})
+        self.invalidate_caches()
         
         print(f"Theme '{theme_name}' created successfully!")
         
@@ -140,6 +405,7 @@ class PriorityRanker:
         print("Enter items (one per line, empty line to finish):")
         
         items = self.load_items(theme)
+        existing = set(items)
         new_items = []
         
         while True:
@@ -149,15 +415,19 @@ class PriorityRanker:
             if len(item) > 100:
                 print("Item too long (max 100 characters)!")
                 continue
-            if item in items:
+            if item in existing:
                 print("Item already exists!")
                 continue
             
+            existing.add(item)
             new_items.append(item)
             items.append(item)
         
         if new_items:
             self.save_items(theme, items)
+            # Invalidate first so initialize_ratings reloads and backfills
+            # instead of returning ratings cached before the new items
+            self.invalidate_caches()
             self.initialize_ratings(theme, items)
             print(f"Added {len(new_items)} items to '{theme}'")
         else:
@@ -177,48 +447,68 @@ class PriorityRanker:
         print("Use '<' to choose left item, '>' to choose right item, 'q' to quit")
         print()
         
-        while True:
-            # Pick two random distinct items
-            item1, item2 = random.sample(items, 2)
-            
-            print(f"Which is more important/better?")
-            print(f"  <  {item1}")
-            print(f"  >  {item2}")
-            print()
-            
-            choice = input("Your choice (</>): ").strip().lower()
-            
-            if choice == 'q':
-                break
-            elif choice == '<':
-                self.update_ratings(theme, item1, item2)
-                print(f"'{item1}' wins!\n")
-            elif choice == '>':
-                self.update_ratings(theme, item2, item1)
-                print(f"'{item2}' wins!\n")
-            else:
-                print("Invalid choice! Use '<', '>', or 'q'\n")
+        # Ratings stay in memory for the session and are flushed periodically
+        # on a background thread while we wait for the next choice
+        dirty = 0
+        pending = None
+        n = len(items)
+        try:
+            while True:
+                # Pick two random distinct items; the second index skips
+                # over the first so no retry loop is needed
+                i = random.randrange(n)
+                j = random.randrange(n - 1)
+                if j >= i:
+                    j += 1
+                item1, item2 = items[i], items[j]
+                
+                print(f"Which is more important/better?")
+                print(f"  <  {item1}")
+                print(f"  >  {item2}")
+                print()
+                
+                choice = input("Your choice (</>): ").strip().lower()
+                
+                if choice == 'q':
+                    break
+                elif choice == '<':
+                    self.update_ratings(ratings, item1, item2, theme)
+                    print(f"'{item1}' wins!\n")
+                elif choice == '>':
+                    self.update_ratings(ratings, item2, item1, theme)
+                    print(f"'{item2}' wins!\n")
+                else:
+                    print("Invalid choice! Use '<', '>', or 'q'\n")
+                    continue
+                
+                dirty += 1
+                if dirty >= SAVE_INTERVAL:
+                    if pending is not None:
+                        pending.result()
+                    pending = self.save_ratings_async(theme, ratings)
+                    dirty = 0
+        finally:
+            # Collect the earlier save first so its errors aren't lost
+            if pending is not None:
+                pending.result()
+            if dirty:
+                self.save_ratings_async(theme, ratings).result()
     
     def view_rankings(self, theme):
         """View current rankings for a theme"""
         items = self.load_items(theme)
-        ratings = self.load_ratings(theme)
         
         if not items:
             print(f"No items in '{theme}'!")
             return
         
-        print(f"\n--- Rankings: {theme} ---")
+        ratings = self.initialize_ratings(theme, items)
         
-        # Sort items by rating
-        sorted_items = []
-        for item in items:
-            if item in ratings:
-                sorted_items.append((item, ratings[item]["rating"]))
-            else:
-                sorted_items.append((item, 1000))
+        print(f"\n--- Rankings: {theme} ---")
         
-        sorted_items.sort(key=lambda x: x[1], reverse=True)
+        # Items sorted by rating, kept up to date by update_ratings
+        ranking = self.get_sorted_rankings(theme, items, ratings)
+        sorted_items = [(item, -neg_rating) for neg_rating, _, item in ranking]
         
         if not sorted_items:
             print("No rankings available!")
@@ -229,14 +519,17 @@ class PriorityRanker:
         min_rating = sorted_items[-1][1] if len(sorted_items) > 1 else max_rating
         rating_range = max_rating - min_rating if max_rating != min_rating else 1
         
+        scale = 49.0 / rating_range if rating_range > 0 else 0.0
+        all_dashes = "-" * 50
+        
         for i, (item, rating) in enumerate(sorted_items):
             # Calculate dash count (1-50 dashes)
             if rating_range > 0:
-                dash_count = int(1 + 49 * (rating - min_rating) / rating_range)
+                dash_count = int(1 + scale * (rating - min_rating))
             else:
                 dash_count = 50
             
-            dashes = "-" * dash_count
+            dashes = all_dashes[:dash_count]
             
             print(f"{i+1:2}. {item}")
             print(f"    {dashes} ({rating:.0f})")
@@ -244,8 +537,8 @@ class PriorityRanker:
             # Show stats if available
             if item in ratings:
                 stats = ratings[item]
-                if stats["plays"] > 0:
-                    print(f"    Plays: {stats['plays']}, Wins: {stats['wins']}, Losses: {stats['losses']}")
+                if stats.plays > 0:
+                    print(f"    Plays: {stats.plays}, Wins: {stats.wins}, Losses: {stats.losses}")
             print()
     
     def show_main_menu(self):
@@ -257,7 +550,7 @@ class PriorityRanker:
         
         if themes:
             for i, theme in enumerate(themes, 1):
-                item_count = len(self.load_items(theme))
+                item_count = self.get_item_count(theme)
                 print(f"  {i}. {theme} ({item_count} items)")
         else:
             print("  No themes available")
@@ -271,71 +564,74 @@ class PriorityRanker:
     
     def run(self):
         """Main application loop"""
-        while True:
-            themes = self.show_main_menu()
-            
-            try:
-                choice = input(f"\nEnter choice (1-{len(themes) + 4}): ").strip()
-                choice_num = int(choice)
-                
-                if 1 <= choice_num <= len(themes):
-                    # Selected a theme for ranking
-                    selected_theme = themes[choice_num - 1]
-                    self.ranking_mode(selected_theme)
+        try:
+            while True:
+                themes = self.show_main_menu()
                 
-                elif choice_num == len(themes) + 1:
-                    # Create new theme
-                    self.create_theme()
-                
-                elif choice_num == len(themes) + 2:
-                    # Add items to existing theme
-                    if not themes:
-                        print("No themes available! Create a theme first.")
-                        continue
+                try:
+                    choice = input(f"\nEnter choice (1-{len(themes) + 4}): ").strip()
+                    choice_num = int(choice)
                     
-                    print("\nSelect theme to add items to:")
-                    for i, theme in enumerate(themes, 1):
-                        print(f"  {i}. {theme}")
+                    if 1 <= choice_num <= len(themes):
+                        # Selected a theme for ranking
+                        selected_theme = themes[choice_num - 1]
+                        self.ranking_mode(selected_theme)
                     
-                    theme_choice = input("Enter theme number: ").strip()
-                    theme_num = int(theme_choice)
+                    elif choice_num == len(themes) + 1:
+                        # Create new theme
+                        self.create_theme()
                     
-                    if 1 <= theme_num <= len(themes):
-                        self.add_items_to_theme(themes[theme_num - 1])
-                    else:
-                        print("Invalid theme selection!")
-                
-                elif choice_num == len(themes) + 3:
-                    # View rankings
-                    if not themes:
-                        print("No themes available! Create a theme first.")
-                        continue
+                    elif choice_num == len(themes) + 2:
+                        # Add items to existing theme
+                        if not themes:
+                            print("No themes available! Create a theme first.")
+                            continue
+                        
+                        print("\nSelect theme to add items to:")
+                        for i, theme in enumerate(themes, 1):
+                            print(f"  {i}. {theme}")
+                        
+                        theme_choice = input("Enter theme number: ").strip()
+                        theme_num = int(theme_choice)
+                        
+                        if 1 <= theme_num <= len(themes):
+                            self.add_items_to_theme(themes[theme_num - 1])
+                        else:
+                            print("Invalid theme selection!")
                     
-                    print("\nSelect theme to view rankings:")
-                    for i, theme in enumerate(themes, 1):
-                        print(f"  {i}. {theme}")
+                    elif choice_num == len(themes) + 3:
+                        # View rankings
+                        if not themes:
+                            print("No themes available! Create a theme first.")
+                            continue
+                        
+                        print("\nSelect theme to view rankings:")
+                        for i, theme in enumerate(themes, 1):
+                            print(f"  {i}. {theme}")
+                        
+                        theme_choice = input("Enter theme number: ").strip()
+                        theme_num = int(theme_choice)
+                        
+                        if 1 <= theme_num <= len(themes):
+                            self.view_rankings(themes[theme_num - 1])
+                        else:
+                            print("Invalid theme selection!")
                     
-                    theme_choice = input("Enter theme number: ").strip()
-                    theme_num = int(theme_choice)
+                    elif choice_num == len(themes) + 4:
+                        # Exit
+                        print("Goodbye!")
+                        break
                     
-                    if 1 <= theme_num <= len(themes):
-                        self.view_rankings(themes[theme_num - 1])
                     else:
-                        print("Invalid theme selection!")
+                        print("Invalid choice!")
                 
-                elif choice_num == len(themes) + 4:
-                    # Exit
-                    print("Goodbye!")
+                except ValueError:
+                    print("Please enter a valid number!")
+                except KeyboardInterrupt:
+                    print("\nGoodbye!")
                     break
-                
-                else:
-                    print("Invalid choice!")
-            
-            except ValueError:
-                print("Please enter a valid number!")
-            except KeyboardInterrupt:
-                print("\nGoodbye!")
-                break
+        finally:
+            self.close()
 
 if __name__ == "__main__":
     ranker = PriorityRanker()